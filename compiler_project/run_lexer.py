@@ -1,18 +1,6 @@
-from simple_lexer import SimpleRegexLexer, Token
-from dataclasses import dataclass
-
-@dataclass
-class Problem:
-    line: int
-    message: str
-    solution: str
-
-class ProblemTracker:
-    def __init__(self):
-        self.problems = []
-    
-    def add_problem(self, line, message, solution):
-        self.problems.append(Problem(line, message, solution))
+import sys
+import functools
+from simple_lexer import SimpleRegexLexer, Token, Problem, ProblemTracker, read_source, INCLUDE_RE
 
 def main():
     print("=" * 80)
@@ -21,8 +9,7 @@ def main():
     
     # Read the C++ code file
     try:
-        with open('text.cpp', 'r') as f:
-            code = f.read()
+        code = read_source('text.cpp')
         print(" Reading: text.cpp")
         print()
     except FileNotFoundError:
@@ -42,18 +29,23 @@ def main():
     print(f"{'Line':>4} | {'Token Type':20} | {'Value'}")
     print("-" * 80)
     
+    # Collect the rows and write them in one go instead of one print() per token
+    rows = []
+    add_row = rows.append
     current_line = 0
-    for token in tokens:
+    for token_type, value, line in zip(tokens.types, tokens.values, tokens.lines):
         # Format token type for nice display
-        display_type = format_token_type(token.type, token.value)
-        display_value = format_token_value(token.value)
+        display_type = format_token_type(token_type, value)
+        display_value = format_token_value(token_type, value)
         
         # Show line number only when it changes
-        if token.line != current_line:
-            print(f"{token.line:4} | {display_type:20} | {display_value}")
-            current_line = token.line
+        if line != current_line:
+            add_row(f"{line:4} | {display_type:20} | {display_value}")
+            current_line = line
         else:
-            print(f"{'':4} | {display_type:20} | {display_value}")
+            add_row(f"{'':4} | {display_type:20} | {display_value}")
+    if rows:
+        sys.stdout.write("\n".join(rows) + "\n")
     
     # Show problems found
     if tracker.problems:
@@ -70,45 +62,50 @@ def main():
     print(f" SUMMARY: {len(tokens)} tokens processed, {len(tracker.problems)} issues found")
     print("=" * 80)
 
+# Token types whose values are preprocessor lines
+_DIRECTIVE_TYPES = frozenset({'STANDARD_LIBRARY', 'OWN_LIBRARY', 'PREPROCESSOR'})
+
+# Display names for token types
+_TYPE_MAP = {
+    'STANDARD_LIBRARY': 'Library File',
+    'OWN_LIBRARY': 'Own Library',
+    'PREPROCESSOR': 'CPP Directive',
+    'KEYWORD': 'Keyword',
+    'TYPE': 'Data type',
+    'IDENTIFIER': lambda v: 'Function' if '(' in v and ')' in v and not v.startswith('#') else 'Identifier',
+    'OPERATOR_1CHAR': 'Operator',
+    'OPERATOR_2CHAR': 'Operator',
+    'SYMBOL': 'Symbol',
+    'COMMENT': 'Comment',
+    'STRING': 'String Literal',
+    'CHAR': 'Character Literal',
+    'INT_NUMBER': 'Number',
+    'FLOAT_NUMBER': 'Number',
+    'HEX_NUMBER': 'Number',
+    'BINARY_NUMBER': 'Number',
+    'OCTAL_NUMBER': 'Number',
+    'BOOLEAN': 'Boolean',
+    'NULL': 'Null',
+    'NAMESPACE': 'Namespace'
+}
+
+@functools.lru_cache(maxsize=4096)
 def format_token_type(token_type: str, value: str) -> str:
     """Format token types for nice presentation"""
-    type_map = {
-        
-        'STANDARD_LIBRARY': 'Library File',
-        'OWN_LIBRARY': 'Own Library',
-        'PREPROCESSOR': 'CPP Directive',
-        'KEYWORD': 'Keyword',
-        'TYPE': 'Data type',
-        'IDENTIFIER': lambda v: 'Function' if '(' in v and ')' in v and not v.startswith('#') else 'Identifier',
-        'OPERATOR_1CHAR': 'Operator',
-        'OPERATOR_2CHAR': 'Operator',
-        'SYMBOL': 'Symbol',
-        'COMMENT': 'Comment',
-        'STRING': 'String Literal',
-        'CHAR': 'Character Literal',
-        'INT_NUMBER': 'Number',
-        'FLOAT_NUMBER': 'Number',
-        'HEX_NUMBER': 'Number',
-        'BINARY_NUMBER': 'Number',
-        'OCTAL_NUMBER': 'Number',
-        'BOOLEAN': 'Boolean',
-        'NULL': 'Null',
-        'NAMESPACE': 'Namespace'
-    }
-    
-    if token_type in type_map:
-        mapper = type_map[token_type]
+    if token_type in _TYPE_MAP:
+        mapper = _TYPE_MAP[token_type]
         if callable(mapper):
             return mapper(value)
         return mapper
     return token_type
 
-def format_token_value(value: str) -> str:
-    """Format token values for nice presentation"""
+@functools.lru_cache(maxsize=4096)
+def format_token_value(token_type: str, value: str) -> str:
+    """Format token values for nice presentation (the lexer already says what each value is)"""
     # Handle comments
-    if value.startswith('//'):
-        return value[2:].strip()
-    elif value.startswith('/*'):
+    if token_type == 'COMMENT':
+        if value[1] == '/':
+            return value[2:].strip()
         # For multi-line comments, show first line only
         lines = value[2:-2].split('\n')
         if len(lines) > 1:
@@ -116,20 +113,20 @@ def format_token_value(value: str) -> str:
         return lines[0].strip() if lines[0].strip() else "multi-line comment"
     
     # Handle strings - show content without quotes
-    if value.startswith('"') and value.endswith('"'):
+    if token_type == 'STRING':
         content = value[1:-1]
         # Handle escape sequences
         content = content.replace('\\n', '\\\\n').replace('\\t', '\\\\t')
         return f'"{content}"'
     
     # Handle characters
-    if value.startswith("'") and value.endswith("'"):
+    if token_type == 'CHAR':
         return f"'{value[1:-1]}'"
     
     # Handle preprocessor
-    if value.startswith('#'):
+    if token_type in _DIRECTIVE_TYPES:
         if 'include' in value:
-            lib_match = re.search(r'[<"]([^>"]+)[>"]', value)
+            lib_match = INCLUDE_RE.search(value)
             if lib_match:
                 return lib_match.group(1)
         return value
@@ -137,7 +134,5 @@ def format_token_value(value: str) -> str:
     return value
 
 
-import re
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
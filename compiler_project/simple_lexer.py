@@ -1,227 +1,381 @@
+import os
 import re
-from typing import List
+import mmap
+import stat
+import bisect
+import multiprocessing
+from typing import List, Optional, Tuple
+from array import array
 from dataclasses import dataclass
 
-@dataclass
+# Allowed libraries
+_ALLOWED_LIBS = frozenset({'iostream', 'stl_library.py', 'stdio.h'})
+
+# Restricted functions 
+_RESTRICTED_FUNCS = {
+    'printf': 'STLLibrary.printf()', 
+    'scanf': 'STLLibrary.scanf()',
+    'malloc': 'STLLibrary.malloc()', 
+    'free': 'STLLibrary.free()'
+}
+
+# Whitespace between tokens (skipped, never turned into tokens)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Library name inside #include <...> or #include "..."
+INCLUDE_RE = re.compile(r'[<"]([^>"]+)[>"]')
+
+def read_source(path: str) -> str:
+    """Read a source file by decoding straight from a memory map of it"""
+    with open(path, 'rb') as f:
+        info = os.fstat(f.fileno())
+        if stat.S_ISREG(info.st_mode) and info.st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # str() decodes from the mapping itself, no intermediate bytes copy
+                code = str(mm, 'utf-8')
+        else:
+            # Empty files, pipes and /proc files cannot be mapped (or report size 0)
+            code = f.read().decode('utf-8')
+    
+    # Same newline handling as reading in text mode
+    if '\r' in code:
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+    return code
+
+@dataclass(slots=True)
+class Problem:
+    line: int
+    message: str
+    solution: str
+
+class ProblemTracker:
+    def __init__(self):
+        self.problems = []
+    
+    def add_problem(self, line, message, solution):
+        self.problems.append(Problem(line, message, solution))
+
+@dataclass(slots=True)
 class Token:
     type: str      # Like "KEYWORD_IF", "NUMBER", "IDENTIFIER"
     value: str     # The actual text like "if", "42", "variable"
     line: int      # Line number in code
     column: int    # Column number in code
     filename: str  # File name
+    start: int = -1  # Offset of the first character in the source (-1 = unknown)
+    end: int = -1    # Offset just past the last character in the source
+
+class TokenStream:
+    """Tokens stored as parallel arrays (one per field) instead of Token objects"""
+    __slots__ = ('filename', 'types', 'values', 'lines', 'columns', 'starts', 'ends')
+
+    def __init__(self, filename: str = "input.txt"):
+        self.filename = filename
+        self.types = []            # Token types
+        self.values = []           # Token text
+        self.lines = array('i')    # Line numbers
+        self.columns = array('i')  # Column numbers
+        self.starts = array('q')   # Source offsets of the first characters
+        self.ends = array('q')     # Source offsets just past the last characters
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> Token:
+        """Build a Token for one entry (convenient, but slower than the arrays)"""
+        return Token(self.types[i], self.values[i], self.lines[i], self.columns[i],
+                     self.filename, self.starts[i], self.ends[i])
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self[i]
 
 class SimpleRegexLexer:
-    def __init__(self, problem_tracker):
-        self.problem_tracker = problem_tracker
-        self.tokens = []
-        
     # ALL REGEX PATTERNS IN ONE PLACE - EASY TO UNDERSTAND
-        self.patterns = {
-            # Comments (C/C++ style)
-            'COMMENT': r'//.*|/\*[\s\S]*?\*/',
+    # (order matters: the first pattern that matches at a position wins)
+    patterns = {
+        # Comments (C/C++ style)
+        'COMMENT': r'//.*|/\*[\s\S]*?\*/',
 
-            # Standard Library Includes
-            'STANDARD_LIBRARY': r'^\s*#\s*include\s*<[^>]+>',
+        # Standard Library Includes
+        'STANDARD_LIBRARY': r'^\s*#\s*include\s*<[^>]+>',
 
-            # Own / Project Includes
-            'OWN_LIBRARY': r'^\s*#\s*include\s*"[^"]+"',
-
-            # Preprocessor Directives
-            'PREPROCESSOR': r'^\s*#\s*(define|undef|ifdef|ifndef|endif|pragma|error|warning|elif|else)\b.*$',
-            
-            # STRINGS & CHARACTERS
-            'STRING': r'"(?:\\.|[^"\\])*"',
-            'CHAR': r"'(?:\\.|[^'\\])'",
-            
-            # NUMBERS
-            'HEX_NUMBER': r'0[xX][0-9a-fA-F]+',      # 0x1A3F
-            'BINARY_NUMBER': r'0[bB][01]+',          # 0b1010
-            'FLOAT_NUMBER': r'(?:\d*\.\d+|\d+\.\d*)(?:[eE][-+]?\d+)?', # 3.14, 2e10
-            'OCTAL_NUMBER': r'0[0-7]+',              # 0777
-            'INT_NUMBER': r'\d+',                    # 42
-            
-            # KEYWORDS (Reserved words)
-            'KEYWORD': r'\b(if|else|for|while|do|return|class|using|struct|public|namespace|private|protected|static|const|virtual|new|delete|sizeof)\b',
-            
-            # TYPES (Data types)
-            'TYPE': r'\b(int|float|double|char|void|bool|long|short|signed|unsigned)\b',
-            
-            # SPECIAL VALUES
-            'BOOLEAN': r'\b(true|false)\b',
-            'NULL': r'\b(nullptr|NULL)\b',
-            
-            # OPERATORS (2-character first, then 1-character)
-            'OPERATOR_2CHAR': r'\+\+|--|->|::|<<|>>|<=|>=|==|!=|&&|\|\||\+=|-=|\*=|\/=|%=',
-            'OPERATOR_1CHAR': r'[+\-*/%=<>!&|~^]',
-            
-            # SYMBOLS
-            'SYMBOL': r'[{}()\[\];,.:?]',
-            
-            # IDENTIFIERS (Variable/function names)
-            'IDENTIFIER': r'[a-zA-Z_]\w*',
-            
-            # NAMESPACE 
-            'NAMESPACE': r'\w+::\w+',
-            
-            # WHITESPACE (to skip)
-            'WHITESPACE': r'\s+',
+        # Own / Project Includes
+        'OWN_LIBRARY': r'^\s*#\s*include\s*"[^"]+"',
 
-   
-        }
+        # Preprocessor Directives
+        'PREPROCESSOR': r'^\s*#\s*(define|undef|ifdef|ifndef|endif|pragma|error|warning|elif|else)\b.*$',
         
-    # COMBINE ALL PATTERNS INTO ONE BIG REGEX 
-        self.master_regex = re.compile(
-            '|'.join(f'(?P<{name}>{pattern})' for name, pattern in self.patterns.items()),
-            re.MULTILINE
-        )
+        # STRINGS & CHARACTERS
+        'STRING': r'"(?:\\.|[^"\\])*"',
+        'CHAR': r"'(?:\\.|[^'\\])'",
+        
+        # NUMBERS
+        'HEX_NUMBER': r'0[xX][0-9a-fA-F]+',      # 0x1A3F
+        'BINARY_NUMBER': r'0[bB][01]+',          # 0b1010
+        'FLOAT_NUMBER': r'(?:\d*\.\d+|\d+\.\d*)(?:[eE][-+]?\d+)?', # 3.14, 2e10
+        'OCTAL_NUMBER': r'0[0-7]+',              # 0777
+        'INT_NUMBER': r'\d+',                    # 42
+        
+        # OPERATORS (2-character first, then 1-character)
+        'OPERATOR_2CHAR': r'\+\+|--|->|::|<<|>>|<=|>=|==|!=|&&|\|\||\+=|-=|\*=|\/=|%=',
+        'OPERATOR_1CHAR': r'[+\-*/%=<>!&|~^]',
+        
+        # SYMBOLS
+        'SYMBOL': r'[{}()\[\];,.:?]',
+        
+        # IDENTIFIERS (Variable/function names, reserved words are picked out below)
+        'IDENTIFIER': r'[a-zA-Z_]\w*',
+        
+        # NAMESPACE 
+        'NAMESPACE': r'\w+::\w+',
+    }
+
+    # RESERVED WORDS - matched once by IDENTIFIER, then classified with one lookup
+    # instead of running a \b(if|else|...)\b alternation for every word
+    reserved_words = {
+        # KEYWORDS (Reserved words)
+        **dict.fromkeys([
+            'if', 'else', 'for', 'while', 'do', 'return', 'class', 'using', 'struct',
+            'public', 'namespace', 'private', 'protected', 'static', 'const',
+            'virtual', 'new', 'delete', 'sizeof'
+        ], 'KEYWORD'),
+
+        # TYPES (Data types)
+        **dict.fromkeys([
+            'int', 'float', 'double', 'char', 'void', 'bool', 'long', 'short',
+            'signed', 'unsigned'
+        ], 'TYPE'),
+
+        # SPECIAL VALUES
+        'true': 'BOOLEAN',
+        'false': 'BOOLEAN',
+        'nullptr': 'NULL',
+        'NULL': 'NULL',
+    }
 
-    def tokenize(self, code: str, filename: str = "input.txt") -> List[Token]:
+    # FIRST CHARACTER EACH PATTERN CAN START WITH
+    # Lets tokenize skip patterns that cannot possibly match at a position
+    first_chars = {
+        'COMMENT': r'/',
+        'STANDARD_LIBRARY': r'#',
+        'OWN_LIBRARY': r'#',
+        'PREPROCESSOR': r'#',
+        'STRING': r'"',
+        'CHAR': r"'",
+        'HEX_NUMBER': r'0',
+        'BINARY_NUMBER': r'0',
+        'FLOAT_NUMBER': r'[\d.]',
+        'OCTAL_NUMBER': r'0',
+        'INT_NUMBER': r'\d',
+        'OPERATOR_2CHAR': r'[-+<>=!&|*/%:]',
+        'OPERATOR_1CHAR': r'[+\-*/%=<>!&|~^]',
+        'SYMBOL': r'[{}()\[\];,.:?]',
+        'IDENTIFIER': r'[a-zA-Z_]',
+        'NAMESPACE': r'\w',
+    }
+
+    # COMPILE EACH PATTERN ONCE, KEEPING THE PRIORITY ORDER ABOVE
+    # Compiled when the class is created and shared by every lexer
+    compiled_patterns = [
+        (name, re.compile(pattern, re.MULTILINE)) for name, pattern in patterns.items()
+    ]
+
+    # Patterns worth trying for each first character, filled in as characters are seen
+    dispatch_table = {}
+
+    def __init__(self, problem_tracker):
+        self.problem_tracker = problem_tracker
+        self.tokens = TokenStream()
+
+    def tokenize(self, code: str, filename: str = "input.txt") -> TokenStream:
         """MAIN FUNCTION - Convert code into tokens"""
-        self.tokens = []
-        line_num = 1
-        line_start = 0
+        self.tokens = tokens = TokenStream(filename)
         
         # Find all line starts for accurate line/column numbers
+        # (str.find scans for each newline in C instead of looping per character)
         line_starts = [0]
-        for i, char in enumerate(code):
-            if char == '\n':
-                line_starts.append(i + 1)
+        newline = code.find('\n')
+        while newline >= 0:
+            line_starts.append(newline + 1)
+            newline = code.find('\n', newline + 1)
+        
+        # Bind hot lookups to locals once instead of on every token
+        reserved_words = self.reserved_words
+        dispatch_table = self.dispatch_table
+        patterns_starting_with = self.patterns_starting_with
+        types, values, starts, ends = tokens.types, tokens.values, tokens.starts, tokens.ends
+        add_type, add_value = types.append, values.append
+        add_line, add_column = tokens.lines.append, tokens.columns.append
+        add_start, add_end = starts.append, ends.append
+        find_problems = self.find_problems
+        bisect_right = bisect.bisect_right
+        skip_whitespace = _WHITESPACE_RE.match
+        directive_patterns = dispatch_table.get('#') or patterns_starting_with('#')
         
-        # Find all tokens using regex
-        for match in self.master_regex.finditer(code):
-            token_type = match.lastgroup
+        # Open parentheses of the function call being combined (0 = none)
+        paren_count = 0
+        
+        # Find all tokens - try the patterns that can start with the current
+        # character, in priority order
+        pos = 0
+        code_length = len(code)
+        while pos < code_length:
+            char = code[pos]
+            
+            # Skip whitespace up front instead of matching it as a token
+            if char.isspace():
+                whitespace_end = skip_whitespace(code, pos).end()
+                line_begin = code.rfind('\n', pos, whitespace_end) + 1 or pos
+                
+                # Directives may be indented: when the whitespace leads up to a '#'
+                # on its own line, let the directive patterns (^\s*#...) match from
+                # the start of that line
+                if (whitespace_end < code_length and code[whitespace_end] == '#' and
+                        (line_begin == 0 or code[line_begin - 1] == '\n')):
+                    pos = line_begin
+                    candidates = directive_patterns
+                else:
+                    pos = whitespace_end
+                    continue
+            else:
+                candidates = dispatch_table.get(char)
+                if candidates is None:
+                    candidates = patterns_starting_with(char)
+            
+            for token_type, pattern in candidates:
+                match = pattern.match(code, pos)
+                if match:
+                    break
+            else:
+                # Nothing matches here (e.g. a stray '@'), skip the character
+                pos += 1
+                continue
+
             value = match.group()
-            start_pos = match.start()
+            start_pos = pos
+            pos = match.end()
             
-            # Calculate line and column
-            line_num = 1
-            while line_num < len(line_starts) and line_starts[line_num] <= start_pos:
-                line_num += 1
+            # Keywords, types and special values only count as whole words
+            if token_type == 'IDENTIFIER' and value in reserved_words:
+                previous_char = code[start_pos - 1] if start_pos else ' '
+                if not (previous_char.isalnum() or previous_char == '_'):
+                    token_type = reserved_words[value]
             
+            # Calculate line and column (binary search over the line starts)
+            line_num = bisect_right(line_starts, start_pos)
             current_line_start = line_starts[line_num - 1]
             column_num = start_pos - current_line_start + 1
-            
-            # Skip whitespace 
-            if token_type == 'WHITESPACE':
-                continue
                 
-            # Create token and check for problems
-            token = Token(token_type, value, line_num, column_num, filename)
-            self.tokens.append(token)
-            
             # Check for coding problems
-            self.find_problems(token, value)
+            find_problems(token_type, value, line_num)
+            
+            # Combine function calls in the same pass: IDENTIFIER followed by
+            # SYMBOL '(' becomes one FUNCTION_CALL token up to the matching ')'
+            if paren_count:
+                ends[-1] = pos
+                if value == "(":
+                    paren_count += 1
+                elif value == ")":
+                    paren_count -= 1
+                    if paren_count == 0:
+                        values[-1] = code[starts[-1]:pos]
+            elif (token_type == "SYMBOL" and value == "(" and
+                  types and types[-1] == "IDENTIFIER"):
+                # The identifier already stored becomes the call
+                types[-1] = "FUNCTION_CALL"
+                ends[-1] = pos
+                paren_count = 1
+            else:
+                add_type(token_type)
+                add_value(value)
+                add_line(line_num)
+                add_column(column_num)
+                add_start(start_pos)
+                add_end(pos)
         
-        # Combine function calls after basic tokenization
-        self.tokens = self.combine_function_calls(self.tokens)
+        # A call still open at the end of the code takes everything after it
+        if paren_count:
+            values[-1] = code[starts[-1]:ends[-1]]
         
-        return self.tokens
+        return tokens
+
+    @classmethod
+    def patterns_starting_with(cls, char: str):
+        """Return the compiled patterns (in priority order) that can start with char"""
+        candidates = [
+            (name, pattern) for name, pattern in cls.compiled_patterns
+            if re.match(cls.first_chars[name], char)
+        ]
+        cls.dispatch_table[char] = candidates
+        return candidates
 
-    def find_problems(self, token: Token, value: str):
+    def find_problems(self, token_type: str, value: str, line: int):
         """Find potential problems in code"""
         
-        # Allowed libraries
-        allowed_libs = {'iostream', 'stl_library.py', 'stdio.h'}
-        
-        # Restricted functions 
-        restricted_funcs = {
-            'printf': 'STLLibrary.printf()', 
-            'scanf': 'STLLibrary.scanf()',
-            'malloc': 'STLLibrary.malloc()', 
-            'free': 'STLLibrary.free()'
-        }
-
         # 1. Check library includes
-        if token.type == 'PREPROCESSOR' and 'include' in value:
-            lib_match = re.search(r'[<"]([^>"]+)[>"]', value)
+        if token_type == 'PREPROCESSOR' and 'include' in value:
+            lib_match = INCLUDE_RE.search(value)
             if lib_match:
                 lib = lib_match.group(1)
-                if lib not in allowed_libs:
+                if lib not in _ALLOWED_LIBS:
                     self.problem_tracker.add_problem(
-                        token.line,
+                        line,
                         f"Unauthorized library: {lib}",
-                        f"Allowed: {', '.join(allowed_libs)}"
+                        f"Allowed: {', '.join(_ALLOWED_LIBS)}"
                     )
 
         # 2. Check macros
-        elif token.type == 'PREPROCESSOR' and 'define' in value:
+        elif token_type == 'PREPROCESSOR' and 'define' in value:
             if '(' in value:
                 self.problem_tracker.add_problem(
-                    token.line,
+                    line,
                     f"Function-like macro: {value}",
                     "Use constexpr functions instead"
                 )
             else:
                 self.problem_tracker.add_problem(
-                    token.line,
+                    line,
                     f"Constant macro: {value}",
                     "Use constexpr variables instead"
                 )
 
         # 3. Check restricted function calls
-        elif token.type == 'IDENTIFIER' and '(' in value:
-            func_name = value.split('(')[0]
-            if func_name in restricted_funcs:
+        elif token_type == 'IDENTIFIER' and (paren_pos := value.find('(')) >= 0:
+            func_name = value[:paren_pos]
+            if func_name in _RESTRICTED_FUNCS:
                 self.problem_tracker.add_problem(
-                    token.line,
+                    line,
                     f"Direct call to {func_name}()",
-                    f"Use {restricted_funcs[func_name]} instead"
+                    f"Use {_RESTRICTED_FUNCS[func_name]} instead"
                 )
 
         # 4. Check std:: usage
-        elif token.type == 'NAMESPACE' and 'std::' in value:
-            algo_name = value.split('::')[-1]
+        elif token_type == 'NAMESPACE' and 'std::' in value:
+            algo_name = value.rpartition('::')[2]
             self.problem_tracker.add_problem(
-                token.line,
+                line,
                 f"Using std::{algo_name}",
                 f"Learning: Create your own {algo_name} implementation"
             )
 
-    def combine_function_calls(self, tokens: List[Token]) -> List[Token]:
-        """Combine identifier + parentheses into FUNCTION_CALL tokens"""
-        combined = []
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            
-            # Check for function call pattern: IDENTIFIER followed by SYMBOL '('
-            if (token.type == "IDENTIFIER" and 
-                i + 1 < len(tokens) and 
-                tokens[i+1].type == "SYMBOL" and 
-                tokens[i+1].value == "("):
-                
-                func_name = token.value
-                call_tokens = [token.value]
-                start_line = token.line
-                start_column = token.column
-                
-                # Add the opening parenthesis
-                call_tokens.append(tokens[i+1].value)
-                i += 2  # Move past identifier and '('
-                
-                # Collect all tokens inside parentheses
-                paren_count = 1  # We already have one opening parenthesis
-                while i < len(tokens) and paren_count > 0:
-                    current_token = tokens[i]
-                    call_tokens.append(current_token.value)
-                    
-                    if current_token.value == "(":
-                        paren_count += 1
-                    elif current_token.value == ")":
-                        paren_count -= 1
-                    
-                    i += 1
-                
-                # Create combined FUNCTION_CALL token
-                combined.append(Token(
-                    type="FUNCTION_CALL",
-                    value="".join(call_tokens),
-                    line=start_line,
-                    column=start_column,
-                    filename=token.filename
-                ))
-            else:
-                combined.append(token)
-                i += 1
-        
-        return combined
\ No newline at end of file
+    def tokenize_file(self, path: str) -> TokenStream:
+        """Read a source file and tokenize it"""
+        return self.tokenize(read_source(path), path)
+
+def tokenize_parallel(paths: List[str],
+                      processes: Optional[int] = None) -> List[Tuple[TokenStream, List[Problem]]]:
+    """Tokenize several files at once, one worker process per CPU by default
+
+    Returns one (tokens, problems) pair per path, in the same order as paths,
+    where problems are the Problem records a ProblemTracker collected for that
+    file. Not used by run_lexer, which only processes text.cpp.
+    """
+    with multiprocessing.Pool(processes) as pool:
+        return list(pool.imap(_tokenize_in_worker, paths))
+
+def _tokenize_in_worker(path: str) -> Tuple[TokenStream, List[Problem]]:
+    """Tokenize one file inside a worker process of tokenize_parallel"""
+    tracker = ProblemTracker()
+    tokens = SimpleRegexLexer(tracker).tokenize_file(path)
+    return tokens, tracker.problems
@@ -2,10 +2,16 @@
 Enhanced Custom STL Library with Real-world Algorithms (Pure Logic Version)
 """
 
+import re
+import operator
+
+# Positional placeholder like %1, %2 in printf format strings
+_FORMAT_RE = re.compile(r'%([1-9]\d*)')
+
 class STLLibrary:
     def __init__(self):
         self.functions = {
-            'sort': 'Custom quick sort implementation',
+            'sort': 'Timsort-based sorting',
             'swap': 'Element swapping utility', 
             'reverse': 'Sequence reversal algorithm',
             'find': 'Linear search implementation',
@@ -16,37 +22,24 @@ class STLLibrary:
         }
     
     def sort(self, arr, ascending=True):
-        """Custom QuickSort implementation"""
-        if len(arr) <= 1:
-            return arr
-        
-        pivot = arr[len(arr) // 2]
-        left = [x for x in arr if x < pivot]
-        middle = [x for x in arr if x == pivot]
-        right = [x for x in arr if x > pivot]
-        
-        result = self.sort(left) + middle + self.sort(right)
-        return result if ascending else result[::-1]
+        """Sort into a new list (built-in Timsort, runs in C)"""
+        return sorted(arr, reverse=not ascending)
     
     def swap(self, a, b):
         """Swap two elements using tuple unpacking"""
         return b, a
     
     def reverse(self, arr):
-        """Reverse array in-place using two pointers"""
-        left, right = 0, len(arr) - 1
-        while left < right:
-            arr[left], arr[right] = arr[right], arr[left]
-            left += 1
-            right -= 1
+        """Reverse array in-place (slice assignment, done in C)"""
+        arr[:] = arr[::-1]
         return arr
     
     def find(self, arr, target):
-        """Find element in array with linear search"""
-        for i, item in enumerate(arr):
-            if item == target:
-                return i
-        return -1
+        """Find element in array with linear search (done in C by operator.indexOf)"""
+        try:
+            return operator.indexOf(arr, target)
+        except ValueError:
+            return -1
     
     def copy(self, arr):
         """Deep copy array"""
@@ -62,7 +55,14 @@ class STLLibrary:
     
     def printf(self, format_string, *args):
         """Custom formatted output implementation (returns formatted string)"""
-        result = format_string
-        for i, arg in enumerate(args):
-            result = result.replace(f'%{i+1}', str(arg))
-        return result
+        def substitute(match):
+            # Use the longest digit prefix that names an argument, so %12 with one
+            # argument is %1 followed by a literal 2
+            digits = match.group(1)
+            for end in range(len(digits), 0, -1):
+                index = int(digits[:end])
+                if index <= len(args):
+                    return str(args[index - 1]) + digits[end:]
+            return match.group()   # No such argument, leave the placeholder alone
+
+        return _FORMAT_RE.sub(substitute, format_string)